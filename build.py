@@ -3,10 +3,14 @@
 """Lightweight build automation for Whisper PGE executables."""
 from __future__ import annotations
 
+import argparse
+import json
 import os
 import shutil
 import subprocess
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent
@@ -15,65 +19,125 @@ BUILD_DIR = PROJECT_ROOT / "build"
 PYI_BUILD_DIR = PROJECT_ROOT / ".pyinstaller-build"
 PYI_SPEC_DIR = PROJECT_ROOT / ".pyinstaller-spec"
 VERSION_FILE = PROJECT_ROOT / "app" / "version.json"
+GENERATED_DIR = PYI_BUILD_DIR / "generated"
 
 MAIN_ENTRY = PROJECT_ROOT / "main.py"
 UPDATER_ENTRY = PROJECT_ROOT / "updater.py"
+PIP_CACHE_DIR = Path(tempfile.gettempdir()) / "whisperpge-pip-cache"
+UPX_DIR = PROJECT_ROOT / "tools" / "upx"
 
+# Stdlib packages never used at runtime; dropping them shrinks the archive.
+EXCLUDED_MODULES = ("tkinter.test", "test", "distutils", "lib2to3", "pydoc_data", "xmlrpc")
+# The updater only needs requests/packaging/psutil, so it can drop more.
+UPDATER_EXCLUDED_MODULES = ("unittest", "doctest", "pdb", "sqlite3")
 
-def run(cmd: list[str]) -> None:
-    subprocess.check_call(cmd)
+
+def run(cmd: list[str], env_overrides: dict[str, str] | None = None) -> None:
+    env = {**os.environ, **env_overrides} if env_overrides else None
+    subprocess.check_call(cmd, env=env)
 
 
 def ensure_pyinstaller() -> None:
     try:
         import PyInstaller  # noqa: F401
     except ImportError:
-        run([sys.executable, "-m", "pip", "install", "--upgrade", "pip"])
-        run([sys.executable, "-m", "pip", "install", "pyinstaller"])
+        pip_install = [sys.executable, "-m", "pip", "install", "--cache-dir", str(PIP_CACHE_DIR)]
+        run([*pip_install, "--upgrade", "pip"])
+        run([*pip_install, "pyinstaller"])
+
 
+def clean_previous_artifacts(fresh: bool = False) -> None:
+    """Remove stale outputs, keeping PyInstaller's work/spec dirs unless ``fresh``.
 
-def clean_previous_artifacts() -> None:
-    for path in (DIST_DIR, PYI_BUILD_DIR, PYI_SPEC_DIR):
+    PyInstaller tracks dependency hashes in its workpath and invalidates
+    cached analysis on its own, so keeping it around is safe.
+    """
+    paths = (DIST_DIR, PYI_BUILD_DIR, PYI_SPEC_DIR) if fresh else (DIST_DIR,)
+    for path in paths:
         if path.exists():
             shutil.rmtree(path)
     BUILD_DIR.mkdir(exist_ok=True)
 
 
-def build_executable(entry: Path, name: str, add_data: list[tuple[Path, str]] | None = None) -> Path:
+def build_executable(
+    entry: Path,
+    name: str,
+    add_data: list[tuple[Path, str]] | None = None,
+    fresh: bool = False,
+    onefile: bool = True,
+    exclude_modules: tuple[str, ...] = (),
+    search_paths: list[Path] | None = None,
+) -> Path:
     if not entry.exists():
         raise FileNotFoundError(f"Entry point not found: {entry}")
 
+    # Each target gets its own work/spec/config dirs so that builds can run
+    # concurrently without fighting over PyInstaller's shared binCache.
+    workpath = PYI_BUILD_DIR / name
+    env_overrides = {"PYINSTALLER_CONFIG_DIR": str(workpath / "config")}
+
     cmd = [
         sys.executable,
         "-m",
         "PyInstaller",
         "--noconfirm",
-        "--clean",
-        "--onefile",
+        "--onefile" if onefile else "--onedir",
         "--name",
         name,
         "--distpath",
         str(DIST_DIR),
         "--workpath",
-        str(PYI_BUILD_DIR),
+        str(workpath),
         "--specpath",
-        str(PYI_SPEC_DIR),
+        str(PYI_SPEC_DIR / name),
     ]
 
+    if fresh:
+        cmd.append("--clean")
+
+    if UPX_DIR.exists():
+        cmd.extend(["--upx-dir", str(UPX_DIR)])
+
+    for module in (*EXCLUDED_MODULES, *exclude_modules):
+        cmd.extend(["--exclude-module", module])
+
+    for path in search_paths or ():
+        cmd.extend(["--paths", str(path)])
+
     if add_data:
         for source, target in add_data:
             cmd.extend(["--add-data", f"{source}{os.pathsep}{target}"])
 
     cmd.append(str(entry))
-    run(cmd)
+    run(cmd, env_overrides)
+
+    if onefile:
+        built_path = DIST_DIR / f"{name}.exe"
+        if not built_path.exists():
+            raise FileNotFoundError(f"Expected artifact missing: {built_path}")
+
+        destination = BUILD_DIR / built_path.name
+        shutil.move(str(built_path), destination)
+        return destination
 
-    built_path = DIST_DIR / f"{name}.exe"
-    if not built_path.exists():
-        raise FileNotFoundError(f"Expected artifact missing: {built_path}")
+    built_dir = DIST_DIR / name
+    if not (built_dir / f"{name}.exe").exists():
+        raise FileNotFoundError(f"Expected artifact missing: {built_dir / f'{name}.exe'}")
 
-    destination = BUILD_DIR / built_path.name
-    shutil.move(str(built_path), destination)
-    return destination
+    destination = BUILD_DIR / name
+    if destination.exists():
+        shutil.rmtree(destination)
+    shutil.move(str(built_dir), destination)
+    return destination / f"{name}.exe"
+
+
+def write_version_module() -> Path:
+    """Bake the version into a module so the app does not parse JSON at startup."""
+    version = json.loads(VERSION_FILE.read_text(encoding="utf-8"))["version"]
+    GENERATED_DIR.mkdir(parents=True, exist_ok=True)
+    module = GENERATED_DIR / "whisperpge_version.py"
+    module.write_text(f"APP_VERSION = {str(version)!r}\n", encoding="utf-8")
+    return GENERATED_DIR
 
 
 def copy_support_files() -> None:
@@ -82,28 +146,51 @@ def copy_support_files() -> None:
     shutil.copy2(VERSION_FILE, target_version)
 
 
-def main() -> None:
-    ensure_pyinstaller()
-    clean_previous_artifacts()
-
-    print("[build] Building WhisperPGE.exe")
-    build_executable(
-        entry=MAIN_ENTRY,
-        name="WhisperPGE",
-        add_data=[(VERSION_FILE, "app/version.json")],
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Build Whisper PGE executables")
+    parser.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Descarta o cache de análise do PyInstaller e faz um build completo",
     )
-
-    print("[build] Building updater.exe")
-    build_executable(
-        entry=UPDATER_ENTRY,
-        name="updater",
+    parser.add_argument(
+        "--onedir",
+        action="store_true",
+        help="Gera WhisperPGE em modo pasta (sem extração a cada execução)",
     )
+    args = parser.parse_args(argv)
+
+    ensure_pyinstaller()
+    clean_previous_artifacts(fresh=args.fresh)
+    generated_dir = write_version_module()
+
+    print("[build] Building WhisperPGE.exe and updater.exe")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        jobs = [
+            pool.submit(
+                build_executable,
+                entry=MAIN_ENTRY,
+                name="WhisperPGE",
+                add_data=[(VERSION_FILE, "app/version.json")],
+                fresh=args.fresh,
+                onefile=not args.onedir,
+                search_paths=[generated_dir],
+            ),
+            pool.submit(
+                build_executable,
+                entry=UPDATER_ENTRY,
+                name="updater",
+                fresh=args.fresh,
+                exclude_modules=UPDATER_EXCLUDED_MODULES,
+            ),
+        ]
+        for job in jobs:
+            job.result()
 
     copy_support_files()
 
-    for path in (DIST_DIR, PYI_BUILD_DIR, PYI_SPEC_DIR):
-        if path.exists():
-            shutil.rmtree(path)
+    if DIST_DIR.exists():
+        shutil.rmtree(DIST_DIR)
 
     print(f"[build] Artifacts available in {BUILD_DIR}")
 
@@ -3,36 +3,55 @@
 Whisper Transcriber - Transcrição local de áudio/vídeo com interface Tkinter
 Autor: Assistant
 Versão: 1.0
-Requisitos: Python 3.10+, openai-whisper, torch, ffmpeg
+Requisitos: Python 3.10+, faster-whisper
 """
 
 import os
 import sys
+import functools
 import threading
 import importlib
+import importlib.util
 import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import json
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk, filedialog, messagebox
 import warnings
 from datetime import datetime
 
 warnings.filterwarnings("ignore")
 
+PIP_CACHE_DIR = Path(tempfile.gettempdir()) / "whisperpge-pip-cache"
+
+
+def _module_available(module: str) -> bool:
+    """Check whether a module can be imported without executing it.
+
+    Set WHISPERPGE_VERIFY_IMPORTS=1 to really import it and catch broken installs.
+    """
+    if importlib.util.find_spec(module) is None:
+        return False
+    if os.getenv("WHISPERPGE_VERIFY_IMPORTS") == "1":
+        try:
+            __import__(module)
+        except ImportError:
+            return False
+    return True
+
 
 def ensure_runtime_dependencies() -> None:
     """Ensure heavy dependencies are available; install them if missing."""
+    # PyInstaller already bundled everything into the executable
+    if getattr(sys, "frozen", False):
+        return
 
     pip_sets = [
         {
-            "modules": ["torch", "torchaudio"],
-            "packages": ["torch==2.0.1+cpu", "torchaudio==2.0.2+cpu"],
-            "options": ["--extra-index-url", "https://download.pytorch.org/whl/cpu"],
-        },
-        {
-            "modules": ["whisper"],
-            "packages": ["openai-whisper"],
+            "modules": ["faster_whisper", "ctranslate2"],
+            "packages": ["faster-whisper>=1.1.0"],
         },
         {
             "modules": ["numpy"],
@@ -42,89 +61,143 @@ def ensure_runtime_dependencies() -> None:
             "modules": ["requests", "packaging"],
             "packages": ["requests>=2.31.0", "packaging>=23.2"],
         },
-        {
-            "modules": ["psutil"],
-            "packages": ["psutil>=5.9.0"],
-        },
     ]
 
+    missing: list[str] = []
+    packages: list[str] = []
+    options: list[str] = []
+    for bundle in pip_sets:
+        bundle_missing = [module for module in bundle["modules"] if not _module_available(module)]
+        if not bundle_missing:
+            continue
+        missing.extend(bundle_missing)
+        packages.extend(bundle["packages"])
+        options.extend(bundle.get("options", []))
+
+    if not missing:
+        return
+
     log_root = Path(os.getenv("LOCALAPPDATA", Path.home())) / "WhisperPGE" / "logs"
     log_root.mkdir(parents=True, exist_ok=True)
     log_file = log_root / "bootstrap.log"
 
+    # Um único handle com buffer de linha: a saída do pip gera centenas de
+    # linhas e reabrir o arquivo a cada uma custava open/write/close.
+    try:
+        log_handle = log_file.open("a", encoding="utf-8", buffering=1)
+    except OSError:
+        log_handle = None
+
     def log(message: str) -> None:
         stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         line = f"[{stamp}] {message}\n"
         print(line, end="")
-        try:
-            with log_file.open("a", encoding="utf-8") as handle:
-                handle.write(line)
-        except Exception:
-            pass
-
-    for bundle in pip_sets:
-        missing = []
-        for module in bundle["modules"]:
+        if log_handle is not None:
             try:
-                __import__(module)
-            except ImportError:
-                missing.append(module)
-        if not missing:
-            continue
-
-        log(f"Dependências ausentes ({', '.join(missing)}). Instalando {bundle['packages']}...")
-        cmd = [sys.executable, "-m", "pip", "install", "--upgrade"]
-        cmd.extend(bundle.get("options", []))
-        cmd.extend(bundle["packages"])
+                log_handle.write(line)
+            except Exception:
+                pass
+
+    try:
+        # Uma única chamada ao pip resolve todas as dependências de uma vez.
+        log(f"Dependências ausentes ({', '.join(missing)}). Instalando {packages}...")
+        cmd = [sys.executable, "-m", "pip", "install", "--upgrade", "--cache-dir", str(PIP_CACHE_DIR)]
+        cmd.extend(options)
+        cmd.extend(packages)
         try:
-            subprocess.check_call(cmd)
+            # Repassa a saída do pip ao log linha a linha: o executável não tem
+            # console, então esta é a única forma de acompanhar a instalação.
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+            )
+            for linha in process.stdout:
+                linha = linha.rstrip()
+                if linha:
+                    log(f"pip: {linha}")
+            returncode = process.wait()
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, cmd)
             importlib.invalidate_caches()
-            log(f"Instalação concluída: {bundle['packages']}")
+            log(f"Instalação concluída: {packages}")
         except subprocess.CalledProcessError as exc:
-            log(f"Falha ao instalar {bundle['packages']}: {exc}")
+            log(f"Falha ao instalar {packages}: {exc}")
             raise
+    finally:
+        if log_handle is not None:
+            log_handle.close()
 
 
 ensure_runtime_dependencies()
 
 
+@functools.lru_cache(maxsize=1)
 def get_app_version() -> str:
     """Resolve the app version from bundled metadata or repository file."""
-    candidate_paths = []
-    if hasattr(sys, "_MEIPASS"):
-        candidate_paths.append(Path(sys._MEIPASS) / "app" / "version.json")
-    candidate_paths.append(Path(__file__).resolve().parent / "app" / "version.json")
+    try:
+        # Gerado por build.py com a versão de app/version.json
+        from whisperpge_version import APP_VERSION
+        return APP_VERSION
+    except ImportError:
+        pass
 
-    for path in candidate_paths:
-        try:
-            if path.exists():
-                with path.open("r", encoding="utf-8") as handle:
-                    data = json.load(handle)
-                    version = data.get("version")
-                    if version:
-                        return str(version)
-        except Exception:
-            continue
+    if hasattr(sys, "_MEIPASS"):
+        version_file = Path(sys._MEIPASS) / "app" / "version.json"
+    else:
+        version_file = Path(__file__).resolve().parent / "app" / "version.json"
+
+    try:
+        version = json.loads(version_file.read_bytes()).get("version")
+        if version:
+            return str(version)
+    except Exception:
+        pass
     return "dev"
 
 
-APP_VERSION = get_app_version()
-
-
 class TranscricaoCancelada(Exception):
     """Exceção usada para sinalizar cancelamento da transcrição"""
     pass
 
-# Tentativa de importação das dependências
-try:
-    import whisper
-    import torch
-    import re
-except ImportError as e:
-    print(f"Erro ao importar dependências: {e}")
-    print("\nInstale as dependências com:")
-    print("pip install -U openai-whisper torch numpy")
-    sys.exit(1)
+# Pasta persistente dos pesos dos modelos (compartilhada entre execuções)
+PASTA_MODELOS = Path(os.getenv("LOCALAPPDATA", Path.home())) / "WhisperPGE" / "models"
+
+# Taxa de amostragem esperada pelo Whisper
+TAXA_AMOSTRAGEM = 16000
+
+# O áudio pré-decodificado é float32 mono a 16 kHz (64 KB/s, ~230 MB por hora)
+# e fica em memória junto com o arquivo em transcrição. Acima deste limite o
+# próximo arquivo não é pré-decodificado e o transcribe lê direto do caminho.
+DURACAO_MAXIMA_PRE_DECODIFICACAO = 30 * 60  # segundos (~115 MB)
+
+# Quantidade de trechos de 30 s decodificados juntos na GPU
+TAMANHO_LOTE_GPU = 8
+
+# Opções de transcrição montadas uma única vez para cada caminho de inferência.
+# Os dois caminhos usam VAD, pulando trechos de silêncio (o lote já o faz por padrão).
+OPCOES_TRANSCRICAO_GPU = {
+    "language": "pt", "beam_size": 5, "batch_size": TAMANHO_LOTE_GPU, "vad_filter": True,
+}
+OPCOES_TRANSCRICAO_CPU = {"language": "pt", "beam_size": 5, "vad_filter": True}
+
+
+# Filtros do diálogo de seleção de arquivos
+TIPOS_ARQUIVO = (
+    ("Arquivos de mídia", "*.mp3 *.wav *.m4a *.flac *.ogg *.mp4 *.mkv *.mov *.avi *.webm"),
+    ("Arquivos de áudio", "*.mp3 *.wav *.m4a *.flac *.ogg *.aac *.wma"),
+    ("Arquivos de vídeo", "*.mp4 *.mkv *.mov *.avi *.webm *.flv *.wmv"),
+    ("Todos os arquivos", "*.*"),
+)
+
+# Extensões reconhecidas como mídia (derivadas dos filtros acima)
+EXTENSOES_MIDIA = frozenset(
+    padrao[1:] for _, padroes in TIPOS_ARQUIVO[:-1] for padrao in padroes.split()
+)
 
 
 class WhisperTranscriber:
@@ -132,14 +205,18 @@ class WhisperTranscriber:
     
     def __init__(self, root):
         self.root = root
-        self.root.title(f"Whisper PGE v{APP_VERSION}")
+        self.root.title(f"Whisper PGE v{get_app_version()}")
         self.root.geometry("800x400")
         
         # Variáveis de controle
-        self.arquivos_selecionados = []
+        self.arquivos_selecionados = ()
         self.pasta_saida = None
         self.modelo_carregado = None
+        self.transcritor = None
+        self.opcoes_transcricao = None
         self.modelo_atual = None
+        self.lock_modelo = threading.Lock()
+        self.pre_carga_solicitada = None
         self.transcricao_em_andamento = False
         self.arquivo_atual_index = 0
         self.cancelar_evento = threading.Event()
@@ -148,10 +225,8 @@ class WhisperTranscriber:
         # Configurar interface
         self.setup_ui()
         
-        # Verificar ffmpeg na inicialização
-        self.verificar_ffmpeg()
-        
-        # Detectar GPU
+        # Detectar GPU em segundo plano; o backend de transcrição é importado
+        # fora da thread da UI para não travar a janela recém-aberta
         self.verificar_gpu()
     
     def setup_ui(self):
@@ -204,11 +279,22 @@ class WhisperTranscriber:
                                          values=["tiny", "base", "small", "medium"],
                                          state="readonly", width=15)
         self.combo_modelo.grid(row=0, column=1, padx=(10, 0), sticky=tk.W)
+        self.combo_modelo.bind("<<ComboboxSelected>>", self.pre_carregar_modelo)
 
         # Botão de ajuda para modelos
         self.btn_ajuda_modelo = ttk.Button(modelo_frame, text="?", width=3,
                                           command=self.mostrar_info_modelos)
         self.btn_ajuda_modelo.grid(row=0, column=2, padx=(5, 0))
+
+        # Precisão usada na CPU (INT8 é mais rápido; float32 é a referência)
+        ttk.Label(modelo_frame, text="Precisão (CPU):").grid(row=0, column=3, sticky=tk.W,
+                                                             padx=(20, 0))
+        self.var_precisao_cpu = tk.StringVar(value="int8")
+        self.combo_precisao_cpu = ttk.Combobox(modelo_frame, textvariable=self.var_precisao_cpu,
+                                               values=["int8", "float32"],
+                                               state="readonly", width=10)
+        self.combo_precisao_cpu.grid(row=0, column=4, padx=(10, 0), sticky=tk.W)
+        self.combo_precisao_cpu.bind("<<ComboboxSelected>>", self.pre_carregar_modelo)
         
         # Idioma fixo em português
         ttk.Label(config_frame, text="Idioma: Português (Brasil)",
@@ -272,35 +358,38 @@ class WhisperTranscriber:
         self.root.after(0, _atualizar)
         
     
-    def verificar_ffmpeg(self):
-        """Verifica se o ffmpeg está instalado no sistema"""
-        try:
-            subprocess.run(["ffmpeg", "-version"], capture_output=True, 
-                          check=True, creationflags=subprocess.CREATE_NO_WINDOW 
-                          if sys.platform == "win32" else 0)
-            self.ffmpeg_disponivel = True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            self.ffmpeg_disponivel = False
-            messagebox.showwarning(
-                "FFmpeg não encontrado",
-                "FFmpeg não está instalado ou não está no PATH.\n\n"
-                "Para instalar:\n"
-                "• Windows: baixe de ffmpeg.org e adicione ao PATH\n"
-                "• macOS: brew install ffmpeg\n"
-                "• Linux: sudo apt install ffmpeg\n\n"
-                "Alguns formatos podem não funcionar sem FFmpeg."
-            )
-    
     def verificar_gpu(self):
-        """Verifica disponibilidade de GPU com CUDA"""
-        if torch.cuda.is_available():
-            gpu_name = torch.cuda.get_device_name(0)
-            self.label_status.config(text=f"GPU detectada: {gpu_name}", foreground="blue")
+        """Verifica disponibilidade de GPU com CUDA em segundo plano"""
+        def _verificar():
+            try:
+                import ctranslate2
+
+                tem_gpu = ctranslate2.get_cuda_device_count() > 0
+            except Exception as e:
+                self.atualizar_status("Erro ao carregar o backend de transcrição", "red")
+                self.executar_na_ui(
+                    messagebox.showerror,
+                    "Erro",
+                    f"Não foi possível carregar o backend de transcrição:\n{str(e)}",
+                )
+                return
+
+            self.executar_na_ui(self.aplicar_deteccao_gpu, tem_gpu)
+
+        threading.Thread(target=_verificar, daemon=True).start()
+
+    def aplicar_deteccao_gpu(self, tem_gpu):
+        """Atualiza a interface com o resultado da detecção e pré-carrega o modelo"""
+        if tem_gpu:
+            self.label_status.config(text="GPU CUDA detectada", foreground="blue")
         else:
             self.label_status.config(text="GPU não disponível - usando CPU", foreground="orange")
             self.var_usar_gpu.set(False)
             if hasattr(self, "check_gpu"):
                 self.check_gpu.config(state="disabled")
+
+        # Carregar o modelo padrão enquanto o usuário escolhe os arquivos
+        self.pre_carregar_modelo()
     
     def mostrar_info_modelos(self):
         """Mostra informações sobre os modelos disponíveis"""
@@ -331,20 +420,15 @@ Informações dos Modelos Whisper:
     
     def selecionar_arquivos(self):
         """Abre diálogo para seleção de múltiplos arquivos de áudio/vídeo"""
-        tipos_arquivo = [
-            ("Arquivos de mídia", "*.mp3 *.wav *.m4a *.flac *.ogg *.mp4 *.mkv *.mov *.avi *.webm"),
-            ("Arquivos de áudio", "*.mp3 *.wav *.m4a *.flac *.ogg *.aac *.wma"),
-            ("Arquivos de vídeo", "*.mp4 *.mkv *.mov *.avi *.webm *.flv *.wmv"),
-            ("Todos os arquivos", "*.*")
-        ]
-
         arquivos = filedialog.askopenfilenames(
             title="Selecionar arquivos de áudio ou vídeo",
-            filetypes=tipos_arquivo
+            filetypes=TIPOS_ARQUIVO
         )
 
         if arquivos:
-            self.arquivos_selecionados = [Path(arquivo) for arquivo in arquivos]
+            # A verificação de formato acontece ao iniciar a transcrição, fora
+            # da thread da UI (sondar arquivos em rede pode ser lento)
+            self.arquivos_selecionados = tuple(map(Path, arquivos))
 
             if len(self.arquivos_selecionados) == 1:
                 nome_exibido = self.arquivos_selecionados[0].name
@@ -358,6 +442,21 @@ Informações dos Modelos Whisper:
             self.btn_abrir_pasta.config(state="normal")
             self.label_status.config(text="Arquivos selecionados", foreground="green")
 
+    def verificar_arquivo(self, caminho):
+        """Retorna o motivo pelo qual o arquivo não pode ser transcrito, ou None"""
+        if not caminho.exists():
+            return "inexistente"
+        # Extensões conhecidas dispensam a sondagem
+        if caminho.suffix.lower() in EXTENSOES_MIDIA:
+            return None
+        try:
+            import av
+
+            with av.open(str(caminho)) as container:
+                return None if container.streams.audio else "sem_audio"
+        except Exception:
+            return "sem_audio"
+
     def selecionar_pasta_saida(self):
         """Abre diálogo para seleção da pasta de saída"""
         pasta = filedialog.askdirectory(
@@ -374,72 +473,149 @@ Informações dos Modelos Whisper:
 
             self.label_pasta_saida.config(text=nome_pasta, foreground="black")
     
-    def carregar_modelo(self, nome_modelo):
-        """Carrega o modelo Whisper com cache"""
-        if self.modelo_atual != nome_modelo:
-            self.label_status.config(text=f"Carregando modelo {nome_modelo}...", 
-                                    foreground="blue")
-            self.root.update()
-            
+    def opcoes_modelo(self):
+        """Lê as opções de modelo da interface (chamar apenas na thread da UI)"""
+        return self.var_modelo.get(), self.var_usar_gpu.get(), self.var_precisao_cpu.get()
+
+    def carregar_modelo(self, nome_modelo, usar_gpu, precisao_cpu, pre_carga=False):
+        """Carrega o modelo Whisper com cache
+
+        Com ``pre_carga`` o modelo só é carregado se já estiver em PASTA_MODELOS
+        e se ainda for a seleção atual; o status só é alterado fora de uma
+        transcrição.
+        """
+        import ctranslate2
+        from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+        # Determinar dispositivo
+        if usar_gpu and ctranslate2.get_cuda_device_count() > 0:
+            device = "cuda"
+        else:
+            device = "cpu"
+
+        # FP16 na GPU; na CPU usa a precisão escolhida (INT8 por padrão)
+        compute_type = "float16" if device == "cuda" else precisao_cpu
+        chave_modelo = (nome_modelo, device, compute_type)
+
+        def status(texto, cor):
+            if not (pre_carga and self.transcricao_em_andamento):
+                self.atualizar_status(texto, cor)
+
+        # O lock faz a transcrição aguardar um pré-carregamento em andamento
+        with self.lock_modelo:
+            if self.modelo_atual == chave_modelo:
+                return
+
+            # Descartar pré-carregamentos que ficaram obsoletos na fila
+            if pre_carga and (
+                self.transcricao_em_andamento
+                or self.pre_carga_solicitada != (nome_modelo, usar_gpu, precisao_cpu)
+            ):
+                return
+
+            status(f"Carregando modelo {nome_modelo}...", "blue")
+
             try:
-                # Determinar dispositivo
-                if self.var_usar_gpu.get() and torch.cuda.is_available():
-                    device = "cuda"
+                # Carregar modelo (faz download na primeira vez, exceto na
+                # pré-carga, que nunca inicia um download não solicitado)
+                self.modelo_carregado = WhisperModel(nome_modelo, device=device,
+                                                     compute_type=compute_type,
+                                                     download_root=str(PASTA_MODELOS),
+                                                     local_files_only=pre_carga)
+                # Na GPU os trechos do áudio são decodificados em lote; na CPU o
+                # lote só aumenta a latência, então segue o caminho sequencial
+                if device == "cuda":
+                    self.transcritor = BatchedInferencePipeline(model=self.modelo_carregado)
+                    self.opcoes_transcricao = OPCOES_TRANSCRICAO_GPU
                 else:
-                    device = "cpu"
-                
-                # Carregar modelo (faz download na primeira vez)
-                self.modelo_carregado = whisper.load_model(nome_modelo, device=device)
-                self.modelo_atual = nome_modelo
-                
-                self.label_status.config(text=f"Modelo {nome_modelo} carregado", 
-                                       foreground="green")
+                    self.transcritor = self.modelo_carregado
+                    self.opcoes_transcricao = OPCOES_TRANSCRICAO_CPU
+                self.modelo_atual = chave_modelo
+
+                status(f"Modelo {nome_modelo} carregado", "green")
             except Exception as e:
                 raise Exception(f"Erro ao carregar modelo: {str(e)}")
+
+    def pre_carregar_modelo(self, _evento=None):
+        """Carrega o modelo selecionado em segundo plano antes da transcrição"""
+        if self.transcricao_em_andamento:
+            return
+
+        opcoes = self.opcoes_modelo()
+        self.pre_carga_solicitada = opcoes
+
+        def _carregar():
+            try:
+                self.carregar_modelo(*opcoes, pre_carga=True)
+            except Exception:
+                # Modelo ainda não baixado (ou falha no carregamento): uma nova
+                # tentativa, com download e mensagem de erro, ocorre ao transcrever
+                if not self.transcricao_em_andamento:
+                    self.atualizar_status("Modelo será carregado ao transcrever", "orange")
+
+        threading.Thread(target=_carregar, daemon=True).start()
     
-    def transcrever_arquivos(self):
+    def transcrever_arquivos(self, opcoes_modelo):
         """Executa a transcrição dos arquivos selecionados sequencialmente"""
         try:
             # Carregar modelo uma vez
-            modelo_selecionado = self.var_modelo.get()
-            self.carregar_modelo(modelo_selecionado)
+            self.carregar_modelo(*opcoes_modelo)
 
-            total_arquivos = len(self.arquivos_selecionados)
+            arquivos = self.arquivos_selecionados
+            total_arquivos = len(arquivos)
             arquivos_processados = 0
             cancelado = False
 
-            for i, arquivo_atual in enumerate(self.arquivos_selecionados):
-                if self.cancelar_evento.is_set():
-                    cancelado = True
-                    break
+            # Decodifica o próximo arquivo em segundo plano enquanto o atual
+            # é transcrito, sobrepondo leitura/decodificação e inferência.
+            # Custo: até dois áudios decodificados em memória ao mesmo tempo;
+            # arquivos longos são ignorados (ver DURACAO_MAXIMA_PRE_DECODIFICACAO)
+            pre_decodificador = ThreadPoolExecutor(max_workers=1)
+            try:
+                proximo_audio = pre_decodificador.submit(self.decodificar_audio, arquivos[0])
+
+                for i, arquivo_atual in enumerate(arquivos):
+                    if self.cancelar_evento.is_set():
+                        cancelado = True
+                        break
 
-                self.arquivo_atual_index = i
+                    self.arquivo_atual_index = i
 
-                # Atualizar status
-                nome_arquivo = arquivo_atual.name
-                if len(nome_arquivo) > 30:
-                    nome_arquivo = nome_arquivo[:27] + "..."
+                    # Atualizar status
+                    nome_arquivo = arquivo_atual.name
+                    if len(nome_arquivo) > 30:
+                        nome_arquivo = nome_arquivo[:27] + "..."
 
-                status_texto = f"Transcrevendo {i+1}/{total_arquivos}: {nome_arquivo}"
-                self.atualizar_status(status_texto, "blue")
+                    status_texto = f"Transcrevendo {i+1}/{total_arquivos}: {nome_arquivo}"
+                    self.atualizar_status(status_texto, "blue")
 
-                # Calcular progresso inicial para este arquivo
-                progresso_inicial = (i / total_arquivos) * 100
-                self.atualizar_progresso(progresso_inicial)
+                    # Calcular progresso inicial para este arquivo
+                    progresso_inicial = (i / total_arquivos) * 100
+                    self.atualizar_progresso(progresso_inicial)
+
+                    audio = proximo_audio.result()
+                    if i + 1 < total_arquivos:
+                        proximo_audio = pre_decodificador.submit(
+                            self.decodificar_audio, arquivos[i + 1]
+                        )
 
-                # Executar transcrição com captura da saída
-                try:
-                    resultado = self.transcrever_com_feedback(arquivo_atual, i, total_arquivos)
-                except TranscricaoCancelada:
-                    cancelado = True
-                    break
+                    # Executar transcrição acompanhando o progresso
+                    try:
+                        resultado = self.transcrever_com_feedback(
+                            arquivo_atual, i, total_arquivos, audio
+                        )
+                    except TranscricaoCancelada:
+                        cancelado = True
+                        break
 
-                # Processar resultado
-                self.processar_resultado(resultado, arquivo_atual)
+                    # Processar resultado
+                    self.processar_resultado(resultado, arquivo_atual)
 
-                arquivos_processados += 1
+                    arquivos_processados += 1
 
-                # O progresso já é atualizado dentro do transcrever_com_feedback
+                    # O progresso já é atualizado dentro do transcrever_com_feedback
+            finally:
+                pre_decodificador.shutdown(wait=False, cancel_futures=True)
 
             if cancelado:
                 self.atualizar_status("Transcrição interrompida pelo usuário.", "orange")
@@ -477,11 +653,25 @@ Informações dos Modelos Whisper:
             self.executar_na_ui(self.btn_cancelar.config, state="disabled")
             self.transcricao_thread = None
 
-    def transcrever_com_feedback(self, arquivo, indice_arquivo, total_arquivos):
-        """Executa transcrição capturando saída textual para refletir progresso"""
-        import sys
-        import re
+    def decodificar_audio(self, arquivo):
+        """Decodifica o arquivo para PCM mono 16 kHz; retorna None se falhar ou for longo demais"""
+        try:
+            import av
+            from faster_whisper import decode_audio
+
+            # A duração vem do cabeçalho do contêiner, sem decodificar o áudio
+            with av.open(str(arquivo)) as container:
+                duracao = container.duration
+            if duracao is None or duracao / av.time_base > DURACAO_MAXIMA_PRE_DECODIFICACAO:
+                return None
+
+            return decode_audio(str(arquivo), sampling_rate=TAXA_AMOSTRAGEM)
+        except Exception:
+            # O transcribe tentará novamente a partir do caminho e reportará o erro
+            return None
 
+    def transcrever_com_feedback(self, arquivo, indice_arquivo, total_arquivos, audio=None):
+        """Executa transcrição atualizando o progresso a cada segmento decodificado"""
         nome_arquivo = arquivo.name
         if len(nome_arquivo) > 40:
             nome_arquivo = nome_arquivo[:37] + "..."
@@ -491,91 +681,44 @@ Informações dos Modelos Whisper:
             "blue",
         )
 
-        progresso_base = (indice_arquivo / max(total_arquivos, 1)) * 100
-        self.atualizar_progresso(progresso_base)
-
-        self.transcricao_ativa = True
-
         total_arquivos = max(total_arquivos, 1)
 
-        class ProgressCapture:
-            def __init__(self, interface, original_stream, indice, total, monitorar=False):
-                self.interface = interface
-                self.original_stream = original_stream
-                self.indice = indice
-                self.total_arquivos = total
-                self.monitorar = monitorar
-                if monitorar:
-                    self.patterns = [
-                        re.compile(r"(\d{1,3})%\|"),
-                        re.compile(r"(\d{1,3})%"),
-                        re.compile(r"(\d{1,3})/(\d+)"),
-                    ]
-
-            def _extrair_percentual(self, texto):
-                ultimo_trecho = texto
-                if "\r" in texto:
-                    ultimo_trecho = texto.split("\r")[-1]
-                if "\n" in ultimo_trecho:
-                    ultimo_trecho = ultimo_trecho.split("\n")[-1]
-                ultimo_trecho = re.sub(r"\x1b\[[0-9;]*m", "", ultimo_trecho)
-
-                for padrao in self.patterns:
-                    match = padrao.search(ultimo_trecho)
-                    if match:
-                        if padrao.groups == 2:
-                            atual = int(match.group(1))
-                            total = int(match.group(2))
-                            if total > 0:
-                                return (atual / total) * 100
-                        else:
-                            valor = int(match.group(1))
-                            if 0 <= valor <= 100:
-                                return float(valor)
-                return None
-
-            def write(self, texto):
-                if texto:
-                    self.original_stream.write(texto)
-                    self.original_stream.flush()
-
-                if self.monitorar:
-                    percentual_local = self._extrair_percentual(texto)
-                    if percentual_local is not None:
-                        percentual_global = (
-                            (self.indice + percentual_local / 100) / self.total_arquivos
-                        ) * 100
-                        self.interface.atualizar_progresso(
-                            max(0, min(percentual_global, 100))
-                        )
-
-                if self.interface.cancelar_evento.is_set():
-                    raise TranscricaoCancelada()
-
-            def flush(self):
-                self.original_stream.flush()
-
-        original_stdout = sys.stdout
-        original_stderr = sys.stderr
+        progresso_base = (indice_arquivo / total_arquivos) * 100
+        self.atualizar_progresso(progresso_base)
 
-        stdout_capture = ProgressCapture(
-            self, original_stdout, indice_arquivo, total_arquivos, monitorar=False
-        )
-        stderr_capture = ProgressCapture(
-            self, original_stderr, indice_arquivo, total_arquivos, monitorar=True
-        )
+        self.transcricao_ativa = True
 
         try:
-            sys.stdout = stdout_capture
-            sys.stderr = stderr_capture
-
-            opcoes = {
-                "verbose": False,
-                "fp16": self.var_usar_gpu.get() and torch.cuda.is_available(),
-                "language": "pt",
-            }
-
-            resultado = self.modelo_carregado.transcribe(str(arquivo), **opcoes)
+            # Os segmentos são gerados sob demanda: a decodificação avança
+            # conforme o gerador é consumido
+            entrada = audio if audio is not None else str(arquivo)
+            segmentos, info = self.transcritor.transcribe(entrada, **self.opcoes_transcricao)
+
+            # Cada segmento vai para o arquivo com marcadores assim que é
+            # decodificado, sem acumular a lista completa em memória. A escrita
+            # é feita em um arquivo temporário, que só substitui a saída final
+            # se a transcrição terminar, preservando resultados anteriores.
+            _, arquivo_txt_com = self.caminhos_saida(arquivo)
+            arquivo_parcial = arquivo_txt_com.with_suffix(".txt.part")
+            textos = []
+            try:
+                with open(arquivo_parcial, "w", encoding="utf-8") as f:
+                    for segmento in segmentos:
+                        if self.cancelar_evento.is_set():
+                            raise TranscricaoCancelada()
+
+                        textos.append(segmento.text)
+                        self.escrever_segmento(f, segmento.start, segmento.end, segmento.text)
+
+                        if info.duration:
+                            percentual_local = min(segmento.end / info.duration, 1.0)
+                            percentual_global = ((indice_arquivo + percentual_local) / total_arquivos) * 100
+                            self.atualizar_progresso(percentual_global)
+                os.replace(arquivo_parcial, arquivo_txt_com)
+            except BaseException:
+                # Descartar apenas o arquivo parcial da transcrição interrompida
+                arquivo_parcial.unlink(missing_ok=True)
+                raise
 
             progresso_total = ((indice_arquivo + 1) / total_arquivos) * 100
             self.atualizar_progresso(min(max(progresso_total, 0), 100))
@@ -584,34 +727,33 @@ Informações dos Modelos Whisper:
                 "green",
             )
 
-            return resultado
+            return {"text": "".join(textos)}
 
-        except TranscricaoCancelada:
-            raise
         finally:
-            sys.stdout = original_stdout
-            sys.stderr = original_stderr
             self.transcricao_ativa = False
     
-    def processar_resultado(self, resultado, arquivo_original):
-        """Processa o resultado da transcrição e salva os arquivos"""
+    def caminhos_saida(self, arquivo_original):
+        """Retorna os arquivos de saída (sem e com marcadores temporais)"""
         # Determinar pasta de saída
         if self.pasta_saida:
             pasta_destino = self.pasta_saida
         else:
             pasta_destino = arquivo_original.parent
 
-        # Preparar arquivos de saída
         nome_base = arquivo_original.stem
-        arquivo_txt_sem = pasta_destino / f"{nome_base}.txt"
-        arquivo_txt_com = pasta_destino / f"{nome_base}_timestamps.txt"
+        return (
+            pasta_destino / f"{nome_base}.txt",
+            pasta_destino / f"{nome_base}_timestamps.txt",
+        )
+
+    def processar_resultado(self, resultado, arquivo_original):
+        """Processa o resultado da transcrição e salva o texto contínuo"""
+        # O arquivo com marcadores temporais já foi gravado durante a transcrição
+        arquivo_txt_sem, _ = self.caminhos_saida(arquivo_original)
 
         # Salvar arquivo TXT sem marcadores temporais
         self.salvar_txt_sem_timestamps(resultado.get("text", ""), arquivo_txt_sem)
 
-        # Salvar arquivo TXT com marcadores temporais
-        self.salvar_txt_com_timestamps(resultado.get("segments", []), arquivo_txt_com)
-
         texto_final = (resultado.get("text") or "").strip()
         if texto_final:
             print("=" * 60)
@@ -619,17 +761,12 @@ Informações dos Modelos Whisper:
             print(texto_final)
             print("=" * 60)
 
-    def salvar_txt_com_timestamps(self, segments, arquivo_txt):
-        """Salva a transcrição no formato TXT com marcadores temporais [mm:ss.000 --> mm:ss.000]"""
-        with open(arquivo_txt, "w", encoding="utf-8") as f:
-            for segment in segments:
-                # Formatar timestamps no formato solicitado [mm:ss.000 --> mm:ss.000]
-                inicio = self.formatar_tempo_timestamp(segment["start"])
-                fim = self.formatar_tempo_timestamp(segment["end"])
-
-                # Escrever no formato: [02:02.000 --> 02:04.000]  Texto da transcrição
-                texto = segment['text'].strip()
-                f.write(f"[{inicio} --> {fim}]  {texto}\n")
+    def escrever_segmento(self, arquivo, inicio, fim, texto):
+        """Escreve um segmento no formato [mm:ss.000 --> mm:ss.000]  Texto"""
+        arquivo.write(
+            f"[{self.formatar_tempo_timestamp(inicio)} --> "
+            f"{self.formatar_tempo_timestamp(fim)}]  {texto.strip()}\n"
+        )
 
     def salvar_txt_sem_timestamps(self, texto, arquivo_txt):
         """Salva a transcrição em texto contínuo sem marcadores temporais"""
@@ -655,33 +792,72 @@ Informações dos Modelos Whisper:
             messagebox.showinfo("Atenção", "Uma transcrição já está em andamento!")
             return
 
-        # Verificar se todos os arquivos existem
-        arquivos_inexistentes = []
-        for arquivo in self.arquivos_selecionados:
-            if not arquivo.exists():
-                arquivos_inexistentes.append(arquivo.name)
+        # Bloquear novos cliques enquanto os arquivos são verificados
+        self.transcricao_em_andamento = True
+        self.cancelar_evento.clear()
+        self.btn_transcrever.config(state="disabled", text="Verificando...")
+        self.atualizar_status("Verificando arquivos...", "blue")
+
+        # As variáveis do Tk são lidas aqui, na thread da UI, e repassadas à
+        # thread de trabalho, que só atualiza a interface via root.after
+        thread = threading.Thread(
+            target=self.verificar_e_transcrever,
+            args=(self.arquivos_selecionados, self.opcoes_modelo()),
+            daemon=True,
+        )
+        self.transcricao_thread = thread
+        thread.start()
 
-        if arquivos_inexistentes:
-            messagebox.showerror(
-                "Erro",
-                f"Os seguintes arquivos não existem mais:\n" + "\n".join(arquivos_inexistentes)
-            )
+    def verificar_e_transcrever(self, arquivos, opcoes_modelo):
+        """Confere se os arquivos ainda existem e inicia a transcrição"""
+        try:
+            # Em unidades de rede cada stat pode levar dezenas de milissegundos,
+            # então as verificações são feitas em paralelo fora da thread da UI
+            with ThreadPoolExecutor(max_workers=min(8, len(arquivos))) as executor:
+                motivos = list(executor.map(self.verificar_arquivo, arquivos))
+        except Exception as e:
+            self.executar_na_ui(self.cancelar_inicio, "Erro ao verificar arquivos")
+            self.executar_na_ui(messagebox.showerror, "Erro", f"Erro ao verificar os arquivos:\n{str(e)}")
             return
 
-        # Resetar interface
+        arquivos_inexistentes = [
+            arquivo.name for arquivo, motivo in zip(arquivos, motivos) if motivo == "inexistente"
+        ]
+        arquivos_sem_audio = [
+            arquivo.name for arquivo, motivo in zip(arquivos, motivos) if motivo == "sem_audio"
+        ]
+        if arquivos_inexistentes or arquivos_sem_audio:
+            mensagens = []
+            if arquivos_inexistentes:
+                mensagens.append(
+                    "Os seguintes arquivos não existem mais:\n" + "\n".join(arquivos_inexistentes)
+                )
+            if arquivos_sem_audio:
+                mensagens.append(
+                    "Os seguintes arquivos não contêm áudio em formato suportado:\n"
+                    + "\n".join(arquivos_sem_audio)
+                )
+            self.executar_na_ui(self.cancelar_inicio, "Arquivos inválidos")
+            self.executar_na_ui(messagebox.showerror, "Erro", "\n\n".join(mensagens))
+            return
+
+        self.executar_na_ui(self.preparar_interface_transcricao)
+        self.transcrever_arquivos(opcoes_modelo)
+
+    def cancelar_inicio(self, status):
+        """Restaura a interface quando a transcrição não pôde começar"""
+        self.transcricao_em_andamento = False
+        self.transcricao_thread = None
+        self.btn_transcrever.config(state="normal", text="Transcrever")
+        self.atualizar_status(status, "red")
+
+    def preparar_interface_transcricao(self):
+        """Reseta o progresso e habilita o cancelamento"""
         self.progress.config(value=0)
         self.label_percentual.config(text="0%")
-
-        # Iniciar transcrição em thread
-        self.transcricao_em_andamento = True
-        self.cancelar_evento.clear()
-        self.btn_transcrever.config(state="disabled", text="Transcrevendo...")
+        self.btn_transcrever.config(text="Transcrevendo...")
         self.btn_cancelar.config(state="normal")
 
-        thread = threading.Thread(target=self.transcrever_arquivos, daemon=True)
-        self.transcricao_thread = thread
-        thread.start()
-
     def cancelar_transcricao(self):
         """Solicita cancelamento da transcrição em andamento"""
         if not self.transcricao_em_andamento:
@@ -0,0 +1,69 @@
+"""Tests for the updater's asset download."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# The updater creates its log/cache dirs under LOCALAPPDATA at import time
+os.environ["LOCALAPPDATA"] = tempfile.mkdtemp(prefix="whisperpge-test-")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import updater  # noqa: E402
+
+PAYLOAD = os.urandom(256 * 1024) + b"\0" * (256 * 1024)
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    """Ignores ``Accept-Encoding: identity`` and always answers gzip."""
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send_headers(self) -> bytes:
+        body = gzip.compress(PAYLOAD)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return body
+
+    def do_HEAD(self) -> None:
+        self._send_headers()
+
+    def do_GET(self) -> None:
+        self.wfile.write(self._send_headers())
+
+
+class DownloadAssetTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _GzipHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/WhisperPGE.exe"
+        self.dest = Path(tempfile.mkdtemp()) / "WhisperPGE.exe.new"
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_gzip_encoded_response_is_decoded_and_not_presized(self) -> None:
+        progress: list[tuple[int, int]] = []
+
+        digest = updater.download_asset(self.url, self.dest, lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(self.dest.read_bytes(), PAYLOAD)
+        self.assertEqual(digest, hashlib.sha256(PAYLOAD).hexdigest())
+        self.assertEqual(sum(done for done, _ in progress), len(PAYLOAD))
+        # The compressed Content-Length must not be reported as the total size
+        self.assertTrue(all(total == 0 for _, total in progress))
+
+
+if __name__ == "__main__":
+    unittest.main()
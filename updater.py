@@ -3,20 +3,31 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import functools
+import hashlib
 import json
 import os
 import importlib
-import shutil
+import queue
+import logging
 import subprocess
 import sys
 import tempfile
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
+
+PIP_CACHE_DIR = Path(tempfile.gettempdir()) / "whisperpge-pip-cache"
 
 
 def ensure_runtime_dependencies() -> None:
+    # PyInstaller already bundled everything into the executable
+    if getattr(sys, "frozen", False):
+        return
+
     pip_sets = [
         {
             "modules": ["requests", "packaging"],
@@ -28,71 +39,116 @@ def ensure_runtime_dependencies() -> None:
         },
     ]
 
-    log_root = Path(os.getenv("LOCALAPPDATA", Path.home())) / "WhisperPGE" / "logs"
+    # Once the dependencies were verified for this interpreter, skip the
+    # probe loop and the bootstrap log setup on later launches.
+    app_root = Path(os.getenv("LOCALAPPDATA", Path.home())) / "WhisperPGE"
+    stamp_file = app_root / "cache" / "updater-deps.ok"
+    stamp_key = f"{sys.version}|{sys.executable}"
+    try:
+        if stamp_file.read_text(encoding="utf-8") == stamp_key:
+            return
+    except OSError:
+        pass
+
+    log_root = app_root / "logs"
     log_root.mkdir(parents=True, exist_ok=True)
     log_file = log_root / "bootstrap.log"
 
-    def log(message: str) -> None:
-        stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        line = f"[{stamp}] {message}\n"
-        print(line, end="")
+    logger = logging.getLogger("whisperpge.bootstrap")
+    if not logger.handlers:
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        formatter = logging.Formatter("[%(asctime)s] %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        handlers: list[logging.Handler] = [logging.StreamHandler(sys.stdout)]
         try:
-            with log_file.open("a", encoding="utf-8") as handle:
-                handle.write(line)
+            # delay=True: the file is only opened if something actually gets logged
+            handlers.append(logging.FileHandler(log_file, encoding="utf-8", delay=True))
         except Exception:
             pass
-
+        for handler in handlers:
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+    log = logger.info
+
+    missing: list[str] = []
+    packages: list[str] = []
+    options: list[str] = []
     for bundle in pip_sets:
-        missing = []
+        bundle_missing = []
         for module in bundle["modules"]:
             try:
                 __import__(module)
             except ImportError:
-                missing.append(module)
-        if not missing:
+                bundle_missing.append(module)
+        if not bundle_missing:
             continue
-
-        log(f"Dependências do updater ausentes ({', '.join(missing)}). Instalando {bundle['packages']}...")
-        cmd = [sys.executable, "-m", "pip", "install", "--upgrade"]
-        cmd.extend(bundle.get("options", []))
-        cmd.extend(bundle["packages"])
+        missing.extend(bundle_missing)
+        packages.extend(bundle["packages"])
+        options.extend(bundle.get("options", []))
+
+    if missing:
+        # Uma única chamada ao pip resolve todas as dependências de uma vez.
+        log(f"Dependências do updater ausentes ({', '.join(missing)}). Instalando {packages}...")
+        cmd = [sys.executable, "-m", "pip", "install", "--upgrade", "--cache-dir", str(PIP_CACHE_DIR)]
+        cmd.extend(options)
+        cmd.extend(packages)
         try:
             subprocess.check_call(cmd)
             importlib.invalidate_caches()
-            for module in bundle["modules"]:
+            for module in missing:
                 try:
                     __import__(module)
                 except ImportError:
                     raise RuntimeError(f"Falha ao importar {module} após instalação")
-            log(f"Instalação concluída: {bundle['packages']}")
+            log(f"Instalação concluída: {packages}")
         except subprocess.CalledProcessError as exc:
-            log(f"Falha ao instalar {bundle['packages']}: {exc}")
+            log(f"Falha ao instalar {packages}: {exc}")
+            stamp_file.unlink(missing_ok=True)
             raise
 
+    try:
+        stamp_file.parent.mkdir(parents=True, exist_ok=True)
+        stamp_file.write_text(stamp_key, encoding="utf-8")
+    except OSError as exc:
+        log(f"Falha ao gravar {stamp_file}: {exc}")
+
 
 ensure_runtime_dependencies()
 
+import psutil
 import requests
-from packaging.version import Version
+from packaging.version import InvalidVersion, Version
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 try:
     import winreg  # type: ignore
 except ImportError:  # pragma: no cover - non-Windows platforms
     winreg = None  # type: ignore
 
-try:
-    import tkinter as tk
-    from tkinter import messagebox
-except Exception:  # pragma: no cover - headless environments
-    tk = None  # type: ignore
-    messagebox = None  # type: ignore
-
 REPO_OWNER = "kaoyeoshiro"
 REPO_NAME = "whisper_PGE"
 ASSET_NAME = "WhisperPGE.exe"
 RUN_KEY = r"Software\Microsoft\Windows\CurrentVersion\Run"
 RUN_VALUE_NAME = "WhisperPGE-Updater"
 USER_AGENT = "WhisperPGE-Updater"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+RELEASE_CACHE_TTL = 6 * 60 * 60  # seconds
+DOWNLOAD_PARTS = 4
+MIN_PARALLEL_DOWNLOAD_SIZE = 8 * 1024 * 1024
+
+# One session for the metadata call, the HEAD probe and every download part,
+# so connections (and their TLS handshakes) are reused.
+SESSION = requests.Session()
+SESSION.headers["User-Agent"] = USER_AGENT
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=DOWNLOAD_PARTS * 2,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+    ),
+)
 
 
 def get_install_root() -> Path:
@@ -115,24 +171,50 @@ def ensure_log_file() -> Path:
 LOG_PATH = ensure_log_file()
 
 
+def get_cache_dir() -> Path:
+    local_app = Path(os.getenv("LOCALAPPDATA", get_install_root()))
+    cache_dir = local_app / "WhisperPGE" / "cache"
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def get_cache_file() -> Path:
+    return get_cache_dir() / "release.json"
+
+
+logger = logging.getLogger("whisperpge.updater")
+logger.setLevel(logging.INFO)
+logger.propagate = False
+try:
+    _log_handler = RotatingFileHandler(
+        LOG_PATH, maxBytes=1_000_000, backupCount=3, encoding="utf-8", delay=True
+    )
+    _log_handler.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", datefmt="%Y-%m-%dT%H:%M:%S"))
+    logger.addHandler(_log_handler)
+except Exception:
+    pass  # Logging failures are non-fatal
+
+
 def log(message: str) -> None:
-    timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
-    try:
-        LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with LOG_PATH.open("a", encoding="utf-8") as handle:
-            handle.write(f"[{timestamp}] {message}\n")
-    except Exception:
-        pass  # Logging failures are non-fatal
+    logger.info(message)
 
 
-def read_local_version() -> Version:
+def read_local_version_tag() -> str:
     version_file = get_version_file()
     if not version_file.exists():
-        return Version("0.0.0")
+        return "0.0.0"
     try:
         data = json.loads(version_file.read_text(encoding="utf-8"))
-        return Version(str(data.get("version", "0.0.0")))
+        return str(data.get("version", "0.0.0")).strip()
     except Exception as exc:
+        log(f"Failed to read local version: {exc}")
+        return "0.0.0"
+
+
+def parse_local_version(tag: str) -> Version:
+    try:
+        return Version(tag)
+    except InvalidVersion as exc:
         log(f"Failed to parse local version: {exc}")
         return Version("0.0.0")
 
@@ -149,6 +231,15 @@ def ensure_autostart(command: str) -> None:
         log("winreg unavailable; skipping auto-start registration")
         return
 
+    # The stamp changes whenever the command (i.e. the install path) changes
+    stamp_file = get_cache_dir() / "autostart.stamp"
+    stamp = hashlib.sha256(command.encode("utf-8")).hexdigest()[:16]
+    try:
+        if stamp_file.read_text(encoding="utf-8") == stamp:
+            return
+    except OSError:
+        pass
+
     try:
         with winreg.OpenKey(winreg.HKEY_CURRENT_USER, RUN_KEY, 0, winreg.KEY_SET_VALUE) as key:
             try:
@@ -162,82 +253,346 @@ def ensure_autostart(command: str) -> None:
                 log("Auto-start already registered")
     except PermissionError as exc:
         log(f"Failed to register auto-start (permission error): {exc}")
+        return
+
+    try:
+        stamp_file.write_text(stamp, encoding="utf-8")
+    except OSError as exc:
+        log(f"Failed to write auto-start stamp: {exc}")
+
+
+def read_release_cache() -> dict[str, Any]:
+    try:
+        return json.loads(get_cache_file().read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
+
+def write_release_cache(cache: dict[str, Any]) -> None:
+    try:
+        get_cache_file().write_text(json.dumps(cache), encoding="utf-8")
+    except Exception as exc:
+        log(f"Failed to write release cache: {exc}")
 
 
-def request_latest_release() -> dict[str, Any]:
+def request_latest_release(force: bool = False, silent: bool = False) -> dict[str, Any]:
     url = f"https://api.github.com/repos/{REPO_OWNER}/{REPO_NAME}/releases/latest"
-    response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=15)
+    cache = {} if force else read_release_cache()
+    payload = cache.get("payload")
+
+    # The TTL only spares the login-time --silent run; interactive checks
+    # always revalidate with GitHub (cheaply, via the conditional request).
+    if silent and payload and time.time() - float(cache.get("fetched_at", 0)) < RELEASE_CACHE_TTL:
+        log("Release metadata cached recently; skipping request")
+        return payload
+
+    headers = {}
+    if payload:
+        if cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        if cache.get("last_modified"):
+            headers["If-Modified-Since"] = cache["last_modified"]
+
+    response = SESSION.get(url, headers=headers, timeout=15)
+    if response.status_code == 304 and payload:
+        log("Release metadata not modified; using cached copy")
+        cache["fetched_at"] = time.time()
+        write_release_cache(cache)
+        return payload
     response.raise_for_status()
-    return response.json()
+
+    payload = response.json()
+    write_release_cache(
+        {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "payload": payload,
+        }
+    )
+    return payload
 
 
-def parse_remote_version(release: dict[str, Any]) -> Version:
+def get_remote_tag(release: dict[str, Any]) -> str:
     tag = str(release.get("tag_name", "")).strip()
     if not tag:
         raise ValueError("Release tag missing")
     if tag.lower().startswith("v"):
         tag = tag[1:]
-    return Version(tag)
+    return tag
 
 
-def find_asset_url(release: dict[str, Any]) -> str:
+def find_asset(release: dict[str, Any]) -> tuple[str, str | None]:
+    """Return the download URL and the ``sha256:...`` digest (if published)."""
     assets = release.get("assets", [])
     for asset in assets:
         if asset.get("name") == ASSET_NAME:
-            return str(asset.get("browser_download_url"))
+            return str(asset.get("browser_download_url")), asset.get("digest")
     raise ValueError(f"Asset {ASSET_NAME} not found in release")
 
 
+def _expected_sha256(asset_digest: str | None) -> str | None:
+    algorithm, _, value = (asset_digest or "").partition(":")
+    return value.lower() if algorithm == "sha256" and value else None
+
+
+def _sha256_file(path: Path) -> str:
+    with path.open("rb") as handle:
+        if sys.version_info >= (3, 11):
+            # Hashes in C without a Python-level read loop
+            return hashlib.file_digest(handle, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        while chunk := handle.read(DOWNLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _ui() -> Any:
+    """Import tkinter on first use; the silent auto-start path never loads Tk."""
+    try:
+        import tkinter
+        import tkinter.messagebox
+        import tkinter.ttk
+    except Exception:  # pragma: no cover - headless environments
+        return None
+    return tkinter
+
+
+_root: Any = None
+
+
+def _destroy_root() -> None:
+    if _root is not None:
+        _root.destroy()
+
+
+def _get_root() -> Any:
+    """Create the hidden Tk root once and reuse it for every dialog."""
+    global _root
+    if _root is None:
+        _root = _ui().Tk()
+        _root.withdraw()
+        atexit.register(_destroy_root)
+    return _root
+
+
 def ask_user_to_update(current_version: Version, new_version: Version) -> bool:
-    if messagebox is None:
+    ui = _ui()
+    if ui is None:
         return True
-    root = tk.Tk()
-    root.withdraw()
-    try:
-        return messagebox.askyesno(
-            "Whisper PGE",
-            f"Nova versão disponível: {new_version} (atual: {current_version}).\nDeseja atualizar agora?",
-            icon="info",
-        )
-    finally:
-        root.destroy()
+    return ui.messagebox.askyesno(
+        "Whisper PGE",
+        f"Nova versão disponível: {new_version} (atual: {current_version}).\nDeseja atualizar agora?",
+        icon="info",
+        parent=_get_root(),
+    )
 
 
 def show_info(message: str) -> None:
-    if messagebox is None:
+    ui = _ui()
+    if ui is None:
         return
-    root = tk.Tk()
-    root.withdraw()
-    try:
-        messagebox.showinfo("Whisper PGE", message)
-    finally:
-        root.destroy()
+    ui.messagebox.showinfo("Whisper PGE", message, parent=_get_root())
 
 
-def download_asset(url: str) -> Path:
-    response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=30, stream=True)
-    response.raise_for_status()
+class RangeNotSupported(Exception):
+    """Raised when the server ignores a Range header."""
+
+
+# Called with (bytes received since the last call, total size or 0)
+ProgressCallback = Callable[[int, int], None]
+
+
+def download_range(
+    url: str, dest: Path, start: int, end: int, progress: ProgressCallback | None = None
+) -> None:
+    headers = {"Accept-Encoding": "identity", "Range": f"bytes={start}-{end}"}
+    with SESSION.get(url, headers=headers, timeout=30, stream=True) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise RangeNotSupported(f"Expected 206 for bytes={start}-{end}, got {response.status_code}")
 
-    fd, temp_path = tempfile.mkstemp(suffix=".exe")
-    with os.fdopen(fd, "wb") as handle:
-        for chunk in response.iter_content(chunk_size=8192):
-            if chunk:
+        # Each part has its own handle, so seek/write never races between threads
+        with dest.open("r+b", buffering=0) as handle:
+            handle.seek(start)
+            for chunk in iter(lambda: response.raw.read(DOWNLOAD_CHUNK_SIZE), b""):
                 handle.write(chunk)
-    return Path(temp_path)
+                if progress:
+                    progress(len(chunk), 0)
+            written = handle.tell() - start
+    if written != end - start + 1:
+        raise IOError(f"Incomplete range bytes={start}-{end}: got {written} bytes")
+
+
+def download_in_parts(url: str, dest: Path, size: int, progress: ProgressCallback | None = None) -> None:
+    with dest.open("wb") as handle:
+        handle.truncate(size)
+
+    part_size = -(-size // DOWNLOAD_PARTS)
+    ranges = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        jobs = [pool.submit(download_range, url, dest, start, end, progress) for start, end in ranges]
+        for job in jobs:
+            job.result()
+
+
+def download_asset(url: str, dest: Path, progress: ProgressCallback | None = None) -> str:
+    """Download ``url`` to ``dest`` and return the SHA-256 hex digest of the file."""
+    headers = {"Accept-Encoding": "identity"}
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    # Per-connection throttling on the CDN makes several ranged streams
+    # noticeably faster than one, when the server supports ranges.
+    head = SESSION.head(url, headers=headers, timeout=15, allow_redirects=True)
+    size = int(head.headers.get("Content-Length", 0)) if head.ok else 0
+    if head.ok:
+        # Release assets redirect to a signed CDN URL; request it directly so
+        # each GET below skips the redirect hop. The signature expires within
+        # minutes, so the resolved URL is not cached across runs.
+        url = head.url
+    if head.headers.get("Accept-Ranges") == "bytes" and size >= MIN_PARALLEL_DOWNLOAD_SIZE:
+        if progress:
+            progress(0, size)
+        try:
+            download_in_parts(url, dest, size, progress)
+            # Parts arrive out of order, so they can only be hashed afterwards
+            return _sha256_file(dest)
+        except RangeNotSupported as exc:
+            log(f"Ranged download unavailable, falling back to single stream: {exc}")
+
+    response = SESSION.get(url, headers=headers, timeout=30, stream=True)
+    response.raise_for_status()
+
+    # Read the raw bytes directly; only fall back to urllib3's decoder if the
+    # server ignored "Accept-Encoding: identity". Content-Length then counts
+    # encoded bytes, so it cannot be used to presize or check the file.
+    decode = response.headers.get("Content-Encoding", "identity") != "identity"
+    response.raw.decode_content = decode
+    total = 0 if decode else int(response.headers.get("Content-Length", 0))
+
+    # Hash while streaming so verification needs no second pass over the file
+    digest = hashlib.sha256()
+    with dest.open("wb", buffering=0) as handle:
+        # Reserve the full size up front so the file is not extended chunk by chunk
+        if total:
+            handle.truncate(total)
+        for chunk in iter(lambda: response.raw.read(DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            handle.write(chunk)
+            if progress:
+                progress(len(chunk), total)
+        written = handle.tell()
+    # With the file presized, a short read would otherwise leave zero padding
+    if total and written != total:
+        raise IOError(f"Incomplete download: got {written} of {total} bytes")
+    return digest.hexdigest()
+
+
+def download_with_progress(url: str, dest: Path) -> str:
+    """Run ``download_asset`` on a worker thread while a progress window is shown."""
+    ui = _ui()
+    window = ui.Toplevel(_get_root())
+    window.title("Whisper PGE")
+    window.resizable(False, False)
+    window.protocol("WM_DELETE_WINDOW", lambda: None)
+    ui.ttk.Label(window, text="Baixando atualização...").pack(padx=20, pady=(15, 5))
+    bar = ui.ttk.Progressbar(window, length=300, mode="determinate")
+    bar.pack(padx=20, pady=(0, 15))
+
+    # The worker only touches the queue; Tk widgets are updated here via after()
+    updates: queue.Queue[tuple[int, int]] = queue.Queue()
+    pool = ThreadPoolExecutor(max_workers=1)
+    job = pool.submit(download_asset, url, dest, lambda done, total: updates.put((done, total)))
+    pool.shutdown(wait=False)
+    received = 0
+    total_size = 0
+
+    def poll() -> None:
+        nonlocal received, total_size
+        while True:
+            try:
+                done, total = updates.get_nowait()
+            except queue.Empty:
+                break
+            received += done
+            total_size = total or total_size
+        if total_size:
+            bar.config(maximum=total_size, value=received)
+        elif received:
+            # Size unknown (e.g. encoded response): just show activity
+            bar.config(mode="indeterminate")
+            bar.step()
+        if job.done():
+            window.destroy()
+        else:
+            window.after(100, poll)
+
+    poll()
+    window.wait_window()
+    return job.result()
+
+
+def _post_close_to_windows(pids: set[int]) -> None:
+    """Post WM_CLOSE to the visible top-level windows owned by ``pids``."""
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    wm_close = 0x0010
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def callback(hwnd, _lparam):
+        owner = wintypes.DWORD()
+        user32.GetWindowThreadProcessId(hwnd, ctypes.byref(owner))
+        if owner.value in pids and user32.IsWindowVisible(hwnd):
+            user32.PostMessageW(hwnd, wm_close, 0, 0)
+        return True
+
+    user32.EnumWindows(callback, 0)
 
 
 def stop_running_instances(executable: Path) -> None:
-    exe_name = executable.name
-    try:
-        subprocess.run(["taskkill", "/IM", exe_name, "/F"], check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except FileNotFoundError:
-        log("taskkill not available; skipping process termination")
+    exe_name = executable.name.lower()
+    victims = [
+        proc
+        for proc in psutil.process_iter(["name"])
+        if (proc.info["name"] or "").lower() == exe_name
+    ]
+    if not victims:
+        return
+
+    # Ask the app to close its window first so Tk can shut down cleanly;
+    # only processes that are still around after that get killed.
+    alive = victims
+    if sys.platform == "win32":
+        try:
+            _post_close_to_windows({proc.pid for proc in victims})
+            _, alive = psutil.wait_procs(victims, timeout=3)
+        except Exception as exc:
+            log(f"Failed to request graceful shutdown: {exc}")
+    if len(alive) < len(victims):
+        log(f"Closed running instances: {', '.join(str(proc.pid) for proc in victims if proc not in alive)}")
+    if not alive:
+        return
+
+    for proc in alive:
+        try:
+            proc.kill()
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as exc:
+            log(f"Failed to stop process {proc.pid}: {exc}")
+    log(f"Killed running instances: {', '.join(str(proc.pid) for proc in alive)}")
+
+    # Wait for the handles on the executable to be released before replacing it
+    _, alive = psutil.wait_procs(alive, timeout=5)
+    if alive:
+        log(f"Processes still running after kill: {', '.join(str(proc.pid) for proc in alive)}")
 
 
-def apply_update(temp_file: Path, target_exe: Path, new_version: Version) -> None:
+def apply_update(staged_file: Path, target_exe: Path, new_version: Version) -> None:
     stop_running_instances(target_exe)
-    target_exe.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(temp_file, target_exe)
+    # The staged file sits next to the target, so this is an atomic rename
+    os.replace(staged_file, target_exe)
     write_local_version(new_version)
 
 
@@ -247,6 +602,12 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--force", action="store_true", help="Instala mesmo se versões forem iguais")
     args = parser.parse_args(argv)
 
+    # The release lookup is network bound, so it runs while the local
+    # bookkeeping (Run key, version.json) happens on this thread.
+    pool = ThreadPoolExecutor(max_workers=1)
+    release_job = pool.submit(request_latest_release, args.force, args.silent)
+    pool.shutdown(wait=False)
+
     if getattr(sys, "frozen", False):
         executable_path = Path(sys.executable).resolve()
         autostart_command = f'"{executable_path}" --silent'
@@ -256,20 +617,40 @@ def main(argv: list[str] | None = None) -> int:
     ensure_autostart(autostart_command)
 
     try:
-        local_version = read_local_version()
-        log(f"Local version: {local_version}")
-
-        release = request_latest_release()
-        remote_version = parse_remote_version(release)
-        log(f"Remote version: {remote_version}")
-
-        if not args.force and remote_version <= local_version:
+        # Interactive runs will show a dialog either way; pay the Tk start-up
+        # cost now, while the request is in flight.
+        if not args.silent and _ui() is not None:
+            _get_root()
+
+        local_tag = read_local_version_tag()
+        log(f"Local version: {local_tag}")
+
+        release = release_job.result()
+        remote_tag = get_remote_tag(release)
+        log(f"Remote version: {remote_tag}")
+
+        # Identical tags are the common "no update" case and need no parsing
+        if not args.force and (
+            remote_tag == local_tag or Version(remote_tag) <= parse_local_version(local_tag)
+        ):
             log("No update required")
             if not args.silent:
                 show_info("Você já está usando a versão mais recente do Whisper PGE.")
             return 0
 
-        asset_url = find_asset_url(release)
+        local_version = parse_local_version(local_tag)
+        remote_version = Version(remote_tag)
+        asset_url, asset_digest = find_asset(release)
+        expected_sha256 = _expected_sha256(asset_digest)
+        target_exe = get_install_root() / ASSET_NAME
+        if expected_sha256 and target_exe.exists():
+            if _sha256_file(target_exe) == expected_sha256:
+                log("Binary already matches remote digest; skipping download")
+                write_local_version(remote_version)
+                if not args.silent:
+                    show_info(f"Whisper PGE já está na versão {remote_version}.")
+                return 0
+
         if args.silent:
             user_agreed = True
         else:
@@ -278,16 +659,23 @@ def main(argv: list[str] | None = None) -> int:
             log("User deferred update")
             return 0
 
+        staged_file = target_exe.with_suffix(".exe.new")
         log(f"Downloading update from {asset_url}")
-        temp_file = download_asset(asset_url)
         try:
-            target_exe = get_install_root() / ASSET_NAME
-            apply_update(temp_file, target_exe, remote_version)
+            if args.silent or _ui() is None:
+                downloaded_sha256 = download_asset(asset_url, staged_file)
+            else:
+                downloaded_sha256 = download_with_progress(asset_url, staged_file)
+            if expected_sha256 and downloaded_sha256 != expected_sha256:
+                raise ValueError(
+                    f"Downloaded file digest {downloaded_sha256} does not match release digest {expected_sha256}"
+                )
+            apply_update(staged_file, target_exe, remote_version)
             log("Update applied successfully")
             if not args.silent:
                 show_info(f"Whisper PGE foi atualizado para a versão {remote_version}.")
         finally:
-            temp_file.unlink(missing_ok=True)
+            staged_file.unlink(missing_ok=True)
         return 0
     except Exception as exc:
         log(f"Update failed: {exc}")